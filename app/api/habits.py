@@ -3,6 +3,7 @@
 import uuid
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import get_current_user
@@ -291,28 +292,29 @@ async def create_habits_bulk(
             detail=f"Maximum of 10 habits per challenge. Current: {current_habit_count}, Attempting to add: {len(bulk_data.habits)}"
         )
 
-    # Create all habits
-    created_habits = []
-    for idx, habit_data in enumerate(bulk_data.habits):
-        habit = Habit(
-            id=str(uuid.uuid4()),
-            challenge_id=challenge_id,
-            name=habit_data.name,
-            type=habit_data.type,
-            target_count=habit_data.target_count,
-            preferred_time=habit_data.preferred_time,
-            icon=habit_data.icon,
-            order=habit_data.order if habit_data.order is not None else (current_habit_count + idx),
-            template_id=habit_data.template_id
-        )
-        db.add(habit)
-        created_habits.append(habit)
-
-    # Commit all at once
+    # Create all habits with a single INSERT ... RETURNING statement
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "challenge_id": challenge_id,
+            "name": habit_data.name,
+            "type": habit_data.type,
+            "target_count": habit_data.target_count,
+            "preferred_time": habit_data.preferred_time,
+            "icon": habit_data.icon,
+            "order": habit_data.order if habit_data.order is not None else (current_habit_count + idx),
+            "template_id": habit_data.template_id,
+        }
+        for idx, habit_data in enumerate(bulk_data.habits)
+    ]
+    created_habits = db.scalars(
+        insert(Habit).returning(Habit, sort_by_parameter_order=True),
+        rows
+    ).all()
+
+    # Serialize before committing: RETURNING already populated the
+    # database-generated fields, and commit would expire every habit
+    response = [HabitResponse.model_validate(habit) for habit in created_habits]
     db.commit()
-    
-    # Refresh all to get database-generated fields
-    for habit in created_habits:
-        db.refresh(habit)
 
-    return created_habits
+    return response
@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, invalidate_user
 from app.models.user import User
 from app.schemas.user import UserResponse
 
@@ -47,5 +47,6 @@ async def update_user_profile(
     """
     current_user.name = name
     db.commit()
+    invalidate_user(current_user.id)
     db.refresh(current_user)
     return current_user
@@ -27,6 +27,7 @@ class Settings(BaseSettings):
         FRONTEND_URL: Frontend application URL
         ENVIRONMENT: Application environment (development, production)
         DEBUG: Debug mode flag
+        DISABLE_OPENAPI: Skip OpenAPI schema and docs routes (used by tests)
         LOG_LEVEL: Logging level
     """
 
@@ -121,6 +122,10 @@ class Settings(BaseSettings):
         default=True,
         description="Debug mode flag"
     )
+    DISABLE_OPENAPI: bool = Field(
+        default=False,
+        description="Disable the OpenAPI schema and interactive docs"
+    )
 
     # Logging
     LOG_LEVEL: str = Field(
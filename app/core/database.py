@@ -1,25 +1,39 @@
 """Database connection and session management."""
 
+import functools
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-# Create SQLAlchemy engine
-# Use different args for SQLite vs PostgreSQL
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL,
-        echo=settings.DEBUG,
-        connect_args={"check_same_thread": False},
-    )
-else:
+
+@functools.cache
+def get_engine() -> Engine:
+    """
+    Create the SQLAlchemy engine on first use and return it.
+
+    The engine is built lazily so importing this module does not open a
+    connection pool; later calls return the same engine.
+
+    Returns:
+        Engine: SQLAlchemy engine for settings.DATABASE_URL
+    """
+    # Use different args for SQLite vs PostgreSQL
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return create_engine(
+            settings.DATABASE_URL,
+            echo=settings.DEBUG,
+            connect_args={"check_same_thread": False},
+        )
+
     # Use smaller pool for production (especially on small instances)
     # Keep it minimal to avoid connection overhead on startup
     pool_size = 1 if settings.ENVIRONMENT == "production" else 5
     max_overflow = 2 if settings.ENVIRONMENT == "production" else 10
-    
-    engine = create_engine(
+
+    return create_engine(
         settings.DATABASE_URL,
         echo=settings.DEBUG,
         pool_pre_ping=True,
@@ -32,8 +46,17 @@ else:
         }
     )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@functools.cache
+def get_session_local() -> sessionmaker:
+    """
+    Return the session factory bound to the application engine.
+
+    Returns:
+        sessionmaker: Factory creating SQLAlchemy sessions
+    """
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
 
 # Create Base class for declarative models
 Base = declarative_base()
@@ -53,7 +76,7 @@ def get_db():
             return db.query(Item).all()
         ```
     """
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         yield db
     finally:
@@ -67,4 +90,4 @@ def init_db():
     Creates all tables defined in models if they don't exist.
     This is useful for development. In production, use Alembic migrations.
     """
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
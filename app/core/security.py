@@ -1,11 +1,19 @@
 """Security utilities for JWT tokens and authentication."""
 
+import base64
+import hashlib
+import hmac
+import re
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import List, Optional
+from cachetools import TLRUCache, TTLCache
+import jwt
+from jwt import InvalidTokenError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.config import settings
 from app.core.database import get_db
 from app.models.user import User
@@ -13,11 +21,63 @@ from app.models.user import User
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Signing settings read once; settings do not change while the app is running
+_SECRET_KEY = settings.SECRET_KEY
+_ALGORITHM = settings.ALGORITHM
+
+# Keyword arguments shared by every jwt.decode call
+_DECODE_KWARGS = {"key": _SECRET_KEY, "algorithms": [_ALGORITHM]}
+
+# Compact JWS shape: three non-empty base64url segments separated by dots
+_JWT_SHAPE = re.compile(r"[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+")
+
+# Longest time a verified token payload is reused without re-checking its signature
+TOKEN_CACHE_TTL_SECONDS = 30
+
+
+def _token_cache_expiry(key: str, payload: dict, now: float) -> float:
+    """Expire cached payloads after the cache TTL or the token's own expiry."""
+    return min(now + TOKEN_CACHE_TTL_SECONDS, payload.get("exp", now))
+
+
+# Payloads of successfully decoded tokens, keyed by the SHA-256 of the token
+_token_cache = TLRUCache(maxsize=10000, ttu=_token_cache_expiry, timer=time.time)
+
+# Keys of tokens that failed to decode, so repeated bad tokens skip verification
+INVALID_TOKEN_CACHE_TTL_SECONDS = 60
+_invalid_token_cache = TTLCache(maxsize=20000, ttl=INVALID_TOKEN_CACHE_TTL_SECONDS)
+
+# Digests for the HMAC algorithms that decode_access_tokens_batch verifies itself
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+# PyJWT turns off claim checks along with the signature check unless they are
+# re-enabled, so list them explicitly for the batch path
+_CLAIMS_ONLY_OPTIONS = {
+    "verify_signature": False,
+    "verify_exp": True,
+    "verify_nbf": True,
+    "verify_iat": True,
+    "verify_aud": True,
+    "verify_iss": True,
+}
+
+# Column values of recently authenticated users, keyed by user ID.
+# Only found users are cached, so new accounts are visible immediately.
+USER_CACHE_TTL_SECONDS = 60
+_user_cache = TTLCache(maxsize=5000, ttl=USER_CACHE_TTL_SECONDS)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
 
+    Every token carries a random ``jti`` claim, so two tokens issued for the
+    same data in the same second are still distinct.
+
     Args:
         data: Data to encode in the token (typically user ID)
         expires_delta: Optional expiration time delta
@@ -31,8 +91,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=_ALGORITHM)
     return encoded_jwt
 
 
@@ -40,18 +100,159 @@ def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and validate a JWT access token.
 
+    Successfully decoded payloads are cached for up to
+    ``TOKEN_CACHE_TTL_SECONDS`` (never past the token's ``exp``), so repeated
+    requests with the same token skip signature verification. Tokens that
+    fail are remembered for ``INVALID_TOKEN_CACHE_TTL_SECONDS`` and rejected
+    without verifying them again.
+
     Args:
         token: JWT token string
 
     Returns:
         Optional[dict]: Decoded token payload or None if invalid
     """
+    # Reject strings that cannot be a JWT before hashing or verifying them
+    if not _JWT_SHAPE.fullmatch(token):
+        return None
+
+    key = _token_cache_key(token)
+    if key in _invalid_token_cache:
+        return None
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, **_DECODE_KWARGS)
+    except InvalidTokenError:
+        _invalid_token_cache[key] = True
+        return None
+
+    _token_cache[key] = payload
+    return payload
+
+
+def decode_access_tokens_batch(tokens: List[str]) -> List[Optional[dict]]:
+    """
+    Decode and validate several JWT access tokens.
+
+    For HMAC algorithms the secret is keyed into a single HMAC object that is
+    copied per token, instead of re-keying for every signature check. Tokens
+    whose header names a different algorithm are rejected, and claims
+    (``exp`` etc.) are still validated by PyJWT. Other algorithms fall back to
+    ``decode_access_token`` for each token.
+
+    Args:
+        tokens: JWT token strings
+
+    Returns:
+        List[Optional[dict]]: Decoded payload or None for each token, in order
+    """
+    digestmod = _HMAC_DIGESTS.get(_ALGORITHM)
+    if digestmod is None:
+        return [decode_access_token(token) for token in tokens]
+
+    keyed_hmac = hmac.new(_SECRET_KEY.encode(), digestmod=digestmod)
+    return [_decode_hmac_token(token, keyed_hmac) for token in tokens]
+
+
+def _decode_hmac_token(token: str, keyed_hmac: hmac.HMAC) -> Optional[dict]:
+    """
+    Decode one HMAC-signed token using a pre-keyed HMAC object.
+
+    Args:
+        token: JWT token string
+        keyed_hmac: HMAC object keyed with the secret, copied for this token
+
+    Returns:
+        Optional[dict]: Decoded token payload or None if invalid
+    """
+    if not _JWT_SHAPE.fullmatch(token):
+        return None
+
+    key = _token_cache_key(token)
+    if key in _invalid_token_cache:
+        return None
+    payload = _token_cache.get(key)
+    if payload is not None:
         return payload
-    except JWTError:
+
+    # PyJWT skips its algorithm check when it is not verifying the signature,
+    # so reject headers naming any other algorithm before trusting the MAC
+    try:
+        header = jwt.get_unverified_header(token)
+    except InvalidTokenError:
+        header = {}
+    if header.get("alg") != _ALGORITHM:
+        _invalid_token_cache[key] = True
         return None
 
+    signing_input, _, signature = token.rpartition(".")
+    mac = keyed_hmac.copy()
+    mac.update(signing_input.encode())
+    try:
+        signature_bytes = base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4))
+    except ValueError:
+        signature_bytes = b""
+    if not hmac.compare_digest(mac.digest(), signature_bytes):
+        _invalid_token_cache[key] = True
+        return None
+
+    try:
+        payload = jwt.decode(token, **_DECODE_KWARGS, options=_CLAIMS_ONLY_OPTIONS)
+    except InvalidTokenError:
+        _invalid_token_cache[key] = True
+        return None
+
+    _token_cache[key] = payload
+    return payload
+
+
+def _token_cache_key(token: str) -> str:
+    """Return the cache key for a raw token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def invalidate_user(user_id: str) -> None:
+    """
+    Drop a user from the authentication cache.
+
+    Call this after changing a user's row so the next request reloads it.
+
+    Args:
+        user_id: ID of the user whose cached data is stale
+    """
+    _user_cache.pop(user_id, None)
+
+
+def _load_user(db: Session, user_id: str) -> Optional[User]:
+    """
+    Load a user by ID, using the authentication cache when possible.
+
+    Cached users are attached to ``db`` with ``merge(load=False)``, so no
+    SELECT is emitted and changes to them are still flushed normally.
+
+    Args:
+        db: Database session
+        user_id: ID of the user to load
+
+    Returns:
+        Optional[User]: The user, or None if no such user exists
+    """
+    data = _user_cache.get(user_id)
+    if data is not None:
+        user = User(**data)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        _user_cache[user_id] = {
+            column: getattr(user, column) for column in User.__table__.columns.keys()
+        }
+    return user
+
 
 def is_admin(email: str) -> bool:
     """
@@ -99,7 +300,7 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _load_user(db, user_id)
     if user is None:
         raise credentials_exception
 
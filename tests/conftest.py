@@ -2,19 +2,29 @@
 
 import os
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
+from httpx import ASGITransport, AsyncClient, MockTransport
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+# Test database URL (use in-memory SQLite for speed)
+# A named shared-cache memory database lets all connections in this process see
+# the same data; the name is keyed by pytest-xdist worker so workers never collide
+TEST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TEST_DATABASE_URL = f"sqlite:///file:test_{TEST_WORKER}?mode=memory&cache=shared&uri=true"
 
 # Set test environment before importing app modules
-# Use file::memory:?cache=shared to ensure all connections share the same in-memory database
-os.environ["DATABASE_URL"] = "sqlite:///file::memory:?cache=shared&uri=true"
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 os.environ["SECRET_KEY"] = "test-secret-key-for-testing-only"
+os.environ["DISABLE_OPENAPI"] = "1"
 
 # Import Base first, then all models to register them with Base.metadata
 from app.core.database import Base, get_db
@@ -22,72 +32,255 @@ from app.models.user import User
 from app.models.challenge import Challenge, ChallengeStatus
 from app.models.habit import Habit, HabitType
 from app.models.daily_entry import DailyEntry
-from app.core.security import create_access_token
+from app.core.security import (
+    _invalid_token_cache,
+    _token_cache,
+    _user_cache,
+    create_access_token,
+)
 from app.main import app
 
-# Test database URL (use in-memory SQLite for speed)
-# Use file::memory:?cache=shared to ensure all connections share the same in-memory database
-TEST_DATABASE_URL = "sqlite:///file::memory:?cache=shared&uri=true"
 
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers",
+        "readonly: test only reads from the database; skip per-commit SAVEPOINTs",
+    )
 
-@pytest.fixture(scope="function")
+
+def _enable_sqlite_savepoints(engine) -> None:
+    """
+    Let SQLAlchemy manage transactions on pysqlite connections.
+
+    The sqlite3 driver issues its own BEGIN/COMMIT, which breaks SAVEPOINT
+    handling. Disabling that and emitting BEGIN ourselves is the recipe from
+    the SQLAlchemy SQLite dialect documentation.
+    """
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches() -> None:
+    """Start every test with empty token and user caches."""
+    _token_cache.clear()
+    _invalid_token_cache.clear()
+    _user_cache.clear()
+
+
+@pytest.fixture(scope="session")
 def db_engine():
-    """Create a test database engine."""
+    """
+    Create the test database engine and schema once per test session.
+
+    StaticPool keeps a single connection for the whole session; tests are
+    isolated by transactions and SAVEPOINTs, so no pool is needed.
+    """
     engine = create_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False, "uri": True},
+        poolclass=StaticPool,
         echo=False,
     )
+    _enable_sqlite_savepoints(engine)
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
     engine.dispose()
 
 
+@pytest.fixture(scope="session")
+def seed_user(db_engine) -> str:
+    """Insert the baseline test user once per session and return its ID."""
+    user = User(
+        id=str(uuid.uuid4()),
+        email="test@example.com",
+        name="Test User",
+        picture="https://example.com/picture.jpg",
+        google_id="google_test_123",
+    )
+    with Session(bind=db_engine) as session:
+        session.add(user)
+        session.commit()
+        return user.id
+
+
+@pytest.fixture(scope="session")
+def seed_challenge(db_engine, seed_user: str) -> str:
+    """Insert the baseline test challenge once per session and return its ID."""
+    # Use dynamic dates relative to today to avoid test failures
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    challenge = Challenge(
+        id=str(uuid.uuid4()),
+        user_id=seed_user,
+        start_date=today - timedelta(days=29),  # Started 29 days ago
+        end_date=today - timedelta(days=1),     # Ended yesterday
+        status=ChallengeStatus.ACTIVE,
+    )
+    with Session(bind=db_engine) as session:
+        session.add(challenge)
+        session.commit()
+        return challenge.id
+
+
 @pytest.fixture(scope="function")
-def db_session(db_engine) -> Generator[Session, None, None]:
-    """Create a test database session."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
-    session = TestingSessionLocal()
+def db_session(request, db_engine, seed_challenge: str) -> Generator[Session, None, None]:
+    """
+    Create a test database session wrapped in a rolled-back transaction.
+
+    Commits made by tests or API routes only release a SAVEPOINT, so every
+    change is discarded when the outer transaction is rolled back. The
+    baseline rows from the ``seed_*`` fixtures are committed before this
+    transaction starts and are visible to every test.
+
+    Tests marked ``readonly`` join the outer transaction directly: commits
+    are no-ops and no SAVEPOINTs are issued.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    if request.node.get_closest_marker("readonly"):
+        join_transaction_mode = "rollback_only"
+    else:
+        join_transaction_mode = "create_savepoint"
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode=join_transaction_mode,
+    )
+
+    def override_get_db():
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    app.dependency_overrides[get_db] = override_get_db
     try:
         yield session
     finally:
+        app.dependency_overrides.pop(get_db, None)
         session.close()
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture(scope="function")
-def client(db_engine, db_session: Session) -> Generator[TestClient, None, None]:
-    """Create a test client with database dependency override."""
-    def override_get_db():
+@pytest.fixture
+def count_queries(db_engine):
+    """
+    Return a context manager that records SELECT statements on the test engine.
+
+    Example:
+        ```python
+        with count_queries() as queries:
+            client.get("/api/v1/...")
+        assert len(queries) <= 3
+        ```
+    """
+    @contextmanager
+    def _count_queries():
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                queries.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", before_cursor_execute)
         try:
-            yield db_session
-            db_session.commit()
-        except Exception:
-            db_session.rollback()
-            raise
+            yield queries
         finally:
-            pass
+            event.remove(db_engine, "before_cursor_execute", before_cursor_execute)
 
-    app.dependency_overrides[get_db] = override_get_db
+    return _count_queries
+
+
+@pytest.fixture(scope="session")
+def client(db_engine) -> Generator[TestClient, None, None]:
+    """
+    Create a test client shared by the whole test session.
+
+    Database access is routed to the current test's session by the
+    ``db_session`` fixture, which installs the ``get_db`` override.
+    """
     with TestClient(app) as test_client:
         yield test_client
-    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def authenticated_client(db_engine, auth_token: str) -> Generator[TestClient, None, None]:
+    """Create a session-wide test client that sends the test user's bearer token."""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    with TestClient(app, headers=headers) as test_client:
+        yield test_client
 
 
 @pytest.fixture
-def test_user(db_session: Session) -> User:
-    """Create a test user."""
-    user = User(
-        id=str(uuid.uuid4()),
-        email="test@example.com",
-        name="Test User",
-        picture="https://example.com/picture.jpg",
-        google_id="google_test_123",
+def auth_client(authenticated_client: TestClient, db_session: Session) -> TestClient:
+    """
+    Return the authenticated test client for the current test.
+
+    Depends on ``db_session`` so requests run inside the test's rolled-back
+    transaction, like requests made with ``auth_headers``.
+    """
+    return authenticated_client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client(db_engine) -> AsyncGenerator[AsyncClient, None]:
+    """
+    Create an async client that calls the ASGI app in-process.
+
+    Requests run on the session event loop instead of going through
+    TestClient's thread portal. Tests using it must be marked with
+    ``@pytest.mark.asyncio(loop_scope="session")``.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def mock_httpx(monkeypatch) -> dict:
+    """
+    Route outgoing ``httpx.AsyncClient`` requests to canned responses.
+
+    Returns a dict mapping request URLs to ``httpx.Response`` objects; clients
+    created while the fixture is active use a ``MockTransport`` that serves
+    them instead of hitting the network.
+
+    Example:
+        ```python
+        mock_httpx[GOOGLE_TOKEN_URL] = httpx.Response(200, json={...})
+        ```
+    """
+    responses = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if url not in responses:
+            pytest.fail(f"mock_httpx has no response for {request.method} {url}")
+        return responses[url]
+
+    transport = MockTransport(handler)
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda *args, **kwargs: AsyncClient(*args, transport=transport, **kwargs),
     )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    return responses
+
+
+@pytest.fixture
+def test_user(db_session: Session, seed_user: str) -> User:
+    """Load the seeded test user into the current test's session."""
+    return db_session.get(User, seed_user)
 
 
 @pytest.fixture
@@ -106,34 +299,27 @@ def other_user(db_session: Session) -> User:
     return user
 
 
-@pytest.fixture
-def auth_token(test_user: User) -> str:
-    """Create a JWT token for the test user."""
-    return create_access_token(data={"sub": test_user.id})
+@pytest.fixture(scope="session")
+def auth_token(seed_user: str) -> str:
+    """Create a JWT token for the seeded test user, signed once per session."""
+    return create_access_token(data={"sub": seed_user})
 
 
 @pytest.fixture
-def auth_headers(auth_token: str) -> dict:
-    """Create authorization headers with JWT token."""
+def auth_headers(auth_token: str, db_session: Session) -> dict:
+    """
+    Create authorization headers with JWT token.
+
+    Depends on ``db_session`` so authenticated requests always run inside
+    the current test's rolled-back transaction.
+    """
     return {"Authorization": f"Bearer {auth_token}"}
 
 
 @pytest.fixture
-def test_challenge(db_session: Session, test_user: User) -> Challenge:
-    """Create a test challenge."""
-    # Use dynamic dates relative to today to avoid test failures
-    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    challenge = Challenge(
-        id=str(uuid.uuid4()),
-        user_id=test_user.id,
-        start_date=today - timedelta(days=29),  # Started 29 days ago
-        end_date=today - timedelta(days=1),     # Ended yesterday
-        status=ChallengeStatus.ACTIVE,
-    )
-    db_session.add(challenge)
-    db_session.commit()
-    db_session.refresh(challenge)
-    return challenge
+def test_challenge(db_session: Session, seed_challenge: str, test_user: User) -> Challenge:
+    """Load the seeded test challenge into the current test's session."""
+    return db_session.get(Challenge, seed_challenge)
 
 
 @pytest.fixture
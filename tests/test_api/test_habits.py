@@ -1,79 +1,124 @@
 """Habit API endpoint tests."""
 
 import uuid
+from datetime import datetime
 
+import orjson
 import pytest
 from fastapi import status
+from sqlalchemy import event, func, select
 from sqlalchemy.orm import Session
 
-from app.models.challenge import Challenge
+from app.models.challenge import Challenge, ChallengeStatus
 from app.models.habit import Habit, HabitType
 from app.models.user import User
 
+_BINARY = HabitType.BINARY.value
+_COUNTED = HabitType.COUNTED.value
+
+# Request payloads shared across tests (never mutated by the client)
+_BINARY_PAYLOAD = {
+    "name": "Read for 30 minutes",
+    "type": _BINARY,
+    "preferred_time": "evening",
+}
+_COUNTED_PAYLOAD = {
+    "name": "Drink water",
+    "type": _COUNTED,
+    "target_count": 8,
+    "preferred_time": "afternoon",
+}
+_UPDATE_TYPE_PAYLOAD = {
+    "type": _COUNTED,
+    "target_count": 5,
+}
+_UPDATE_NOT_FOUND_PAYLOAD = {"name": "Updated"}
+_BULK_NOT_FOUND_PAYLOAD = {"habits": [{"name": "Test Habit", "type": _BINARY}]}
+
+
+def _json(response):
+    """Parse a response body with orjson instead of the stdlib json module."""
+    return orjson.loads(response.content)
+
 
 class TestGetChallengeHabits:
     """Tests for GET /api/v1/challenges/{challenge_id}/habits endpoint."""
 
+    @pytest.mark.readonly
     def test_get_habits_success(
         self,
-        client,
+        auth_client,
         test_challenge: Challenge,
         test_binary_habit: Habit,
         test_counted_habit: Habit,
-        auth_headers: dict,
+        count_queries,
     ):
         """Test successfully retrieving habits for a challenge."""
-        response = client.get(
-            f"/api/v1/challenges/{test_challenge.id}/habits",
-            headers=auth_headers,
-        )
+        url = f"/api/v1/challenges/{test_challenge.id}/habits"
+        with count_queries() as queries:
+            response = auth_client.get(url)
+
+        # User lookup, challenge ownership check, and one habits query
+        assert len(queries) <= 3
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = _json(response)
         assert len(data) >= 2
         habit_ids = [h["id"] for h in data]
         assert test_binary_habit.id in habit_ids
         assert test_counted_habit.id in habit_ids
 
+    @pytest.mark.readonly
     def test_get_habits_ordered(
         self,
-        client,
+        auth_client,
         test_challenge: Challenge,
         test_binary_habit: Habit,
         test_counted_habit: Habit,
-        auth_headers: dict,
     ):
         """Test that habits are returned in order."""
-        response = client.get(
+        response = auth_client.get(
             f"/api/v1/challenges/{test_challenge.id}/habits",
-            headers=auth_headers,
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = _json(response)
         # Verify order field is respected
         assert data[0]["order"] <= data[1]["order"]
 
-    def test_get_habits_challenge_not_found(self, client, auth_headers: dict):
-        """Test getting habits for non-existent challenge."""
-        response = client.get(
-            "/api/v1/challenges/nonexistent-id/habits",
-            headers=auth_headers,
-        )
+    @pytest.mark.readonly
+    def test_get_habits_no_lazy_loads(
+        self,
+        auth_client,
+        test_challenge: Challenge,
+        test_binary_habit: Habit,
+        test_counted_habit: Habit,
+        db_session: Session,
+    ):
+        """Test that listing habits never triggers a relationship lazy load."""
+        lazy_loads = []
 
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        def record_relationship_loads(orm_execute_state):
+            if orm_execute_state.is_relationship_load:
+                lazy_loads.append(orm_execute_state.statement)
+
+        url = f"/api/v1/challenges/{test_challenge.id}/habits"
+        event.listen(db_session, "do_orm_execute", record_relationship_loads)
+        try:
+            response = auth_client.get(url)
+        finally:
+            event.remove(db_session, "do_orm_execute", record_relationship_loads)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert lazy_loads == []
 
     def test_get_habits_other_user_challenge(
         self,
-        client,
+        auth_client,
         other_user: User,
-        auth_headers: dict,
         db_session: Session,
     ):
         """Test that users cannot get habits from other users' challenges."""
-        from datetime import datetime
-        from app.models.challenge import ChallengeStatus
-
         # Create challenge for other user
         other_challenge = Challenge(
             id="other-challenge-id",
@@ -85,9 +130,8 @@ class TestGetChallengeHabits:
         db_session.add(other_challenge)
         db_session.commit()
 
-        response = client.get(
+        response = auth_client.get(
             f"/api/v1/challenges/{other_challenge.id}/habits",
-            headers=auth_headers,
         )
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -97,89 +141,77 @@ class TestCreateHabit:
     """Tests for POST /api/v1/challenges/{challenge_id}/habits endpoint."""
 
     def test_create_binary_habit_success(
-        self, client, test_challenge: Challenge, auth_headers: dict
+        self, auth_client, test_challenge: Challenge
     ):
         """Test successfully creating a binary habit."""
-        response = client.post(
+        response = auth_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits",
-            headers=auth_headers,
-            json={
-                "name": "Read for 30 minutes",
-                "type": HabitType.BINARY.value,
-                "preferred_time": "evening",
-            },
+            json=_BINARY_PAYLOAD,
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = _json(response)
         assert data["name"] == "Read for 30 minutes"
-        assert data["type"] == HabitType.BINARY.value
+        assert data["type"] == _BINARY
         assert data["preferredTime"] == "evening"
         assert data["isActive"] is True
 
     def test_create_counted_habit_success(
-        self, client, test_challenge: Challenge, auth_headers: dict
+        self, auth_client, test_challenge: Challenge
     ):
         """Test successfully creating a counted habit."""
-        response = client.post(
+        response = auth_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits",
-            headers=auth_headers,
-            json={
-                "name": "Drink water",
-                "type": HabitType.COUNTED.value,
-                "target_count": 8,
-                "preferred_time": "afternoon",
-            },
+            json=_COUNTED_PAYLOAD,
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = _json(response)
         assert data["name"] == "Drink water"
-        assert data["type"] == HabitType.COUNTED.value
+        assert data["type"] == _COUNTED
         assert data["targetCount"] == 8
 
     def test_create_habit_max_limit(
         self,
-        client,
+        auth_client,
         test_challenge: Challenge,
-        auth_headers: dict,
         db_session: Session,
     ):
         """Test that users cannot create more than 10 habits per challenge."""
-        # Create 10 habits
-        for i in range(10):
-            habit = Habit(
-                id=str(uuid.uuid4()),
-                challenge_id=test_challenge.id,
-                name=f"Habit {i}",
-                type=HabitType.BINARY,
-                order=i,
-                is_active=True,
-            )
-            db_session.add(habit)
+        # Create 10 habits in a single INSERT
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "challenge_id": test_challenge.id,
+                "name": f"Habit {i}",
+                "type": HabitType.BINARY,
+                "order": i,
+                "is_active": True,
+            }
+            for i in range(10)
+        ]
+        db_session.bulk_insert_mappings(Habit, rows)
         db_session.commit()
 
         # Try to create 11th habit
-        response = client.post(
+        response = auth_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits",
-            headers=auth_headers,
             json={
                 "name": "11th Habit",
-                "type": HabitType.BINARY.value,
+                "type": _BINARY,
             },
         )
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        assert "Maximum of 10 habits" in response.json()["detail"]
+        assert "Maximum of 10 habits" in _json(response)["detail"]
 
-    def test_create_habit_challenge_not_found(self, client, auth_headers: dict):
+    def test_create_habit_challenge_not_found(self, auth_client):
         """Test creating habit for non-existent challenge."""
-        response = client.post(
+        response = auth_client.post(
             "/api/v1/challenges/nonexistent-id/habits",
-            headers=auth_headers,
             json={
                 "name": "Test Habit",
-                "type": HabitType.BINARY.value,
+                "type": _BINARY,
             },
         )
 
@@ -187,372 +219,340 @@ class TestCreateHabit:
 
     def test_create_habit_auto_order(
         self,
-        client,
+        auth_client,
         test_challenge: Challenge,
         test_binary_habit: Habit,
-        auth_headers: dict,
     ):
         """Test that habit order is automatically assigned."""
-        response = client.post(
+        response = auth_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits",
-            headers=auth_headers,
             json={
                 "name": "New Habit",
-                "type": HabitType.BINARY.value,
+                "type": _BINARY,
             },
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = _json(response)
         # Should be assigned next order number
         assert data["order"] >= 0
 
 
+@pytest.mark.readonly
 class TestGetHabit:
     """Tests for GET /api/v1/habits/{habit_id} endpoint."""
 
     def test_get_habit_success(
-        self, client, test_binary_habit: Habit, auth_headers: dict
+        self, auth_client, test_binary_habit: Habit
     ):
         """Test successfully retrieving a specific habit."""
-        response = client.get(
+        response = auth_client.get(
             f"/api/v1/habits/{test_binary_habit.id}",
-            headers=auth_headers,
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = _json(response)
         assert data["id"] == test_binary_habit.id
         assert data["name"] == test_binary_habit.name
 
-    def test_get_habit_not_found(self, client, auth_headers: dict):
-        """Test getting non-existent habit."""
-        response = client.get(
-            "/api/v1/habits/nonexistent-id",
-            headers=auth_headers,
-        )
-
-        assert response.status_code == status.HTTP_404_NOT_FOUND
-
 
 class TestUpdateHabit:
-    """Tests for PUT /api/v1/habits/{habit_id} endpoint."""
+    """Tests for PUT /api/v1/habits/{habit_id} endpoint.
+
+    Single-field checks match against the compact JSON body directly
+    instead of parsing the whole response.
+    """
 
     def test_update_habit_name(
-        self, client, test_binary_habit: Habit, auth_headers: dict
+        self, auth_client, test_binary_habit: Habit
     ):
         """Test updating habit name."""
-        response = client.put(
+        response = auth_client.put(
             f"/api/v1/habits/{test_binary_habit.id}",
-            headers=auth_headers,
             json={"name": "Updated Meditation"},
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["name"] == "Updated Meditation"
+        assert b'"name":"Updated Meditation"' in response.content
 
     def test_update_habit_type(
-        self, client, test_binary_habit: Habit, auth_headers: dict
+        self, auth_client, test_binary_habit: Habit
     ):
         """Test updating habit type."""
-        response = client.put(
+        response = auth_client.put(
             f"/api/v1/habits/{test_binary_habit.id}",
-            headers=auth_headers,
-            json={
-                "type": HabitType.COUNTED.value,
-                "target_count": 5,
-            },
+            json=_UPDATE_TYPE_PAYLOAD,
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["type"] == HabitType.COUNTED.value
+        data = _json(response)
+        assert data["type"] == _COUNTED
         assert data["targetCount"] == 5
 
     def test_update_habit_order(
-        self, client, test_binary_habit: Habit, auth_headers: dict
+        self, auth_client, test_binary_habit: Habit
     ):
         """Test updating habit order."""
-        response = client.put(
+        response = auth_client.put(
             f"/api/v1/habits/{test_binary_habit.id}",
-            headers=auth_headers,
             json={"order": 5},
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["order"] == 5
+        assert b'"order":5,' in response.content
 
     def test_update_habit_is_active(
-        self, client, test_binary_habit: Habit, auth_headers: dict
+        self, auth_client, test_binary_habit: Habit
     ):
         """Test archiving a habit by setting is_active to False."""
-        response = client.put(
+        response = auth_client.put(
             f"/api/v1/habits/{test_binary_habit.id}",
-            headers=auth_headers,
             json={"is_active": False},
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["isActive"] is False
+        assert b'"isActive":false' in response.content
 
     def test_update_habit_preferred_time(
-        self, client, test_binary_habit: Habit, auth_headers: dict
+        self, auth_client, test_binary_habit: Habit
     ):
         """Test updating habit preferred_time."""
-        response = client.put(
+        response = auth_client.put(
             f"/api/v1/habits/{test_binary_habit.id}",
-            headers=auth_headers,
             json={"preferred_time": "afternoon"},
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["preferredTime"] == "afternoon"
+        assert b'"preferredTime":"afternoon"' in response.content
 
     def test_update_habit_icon(
-        self, client, test_binary_habit: Habit, auth_headers: dict
+        self, auth_client, test_binary_habit: Habit
     ):
         """Test updating habit icon."""
-        response = client.put(
+        response = auth_client.put(
             f"/api/v1/habits/{test_binary_habit.id}",
-            headers=auth_headers,
             json={"icon": "🎯"},
         )
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
+        data = _json(response)
         assert data["icon"] == "🎯"
 
-    def test_update_habit_not_found(self, client, auth_headers: dict):
-        """Test updating non-existent habit."""
-        response = client.put(
-            "/api/v1/habits/nonexistent-id",
-            headers=auth_headers,
-            json={"name": "Updated"},
-        )
-
-        assert response.status_code == status.HTTP_404_NOT_FOUND
-
 
 class TestDeleteHabit:
     """Tests for DELETE /api/v1/habits/{habit_id} endpoint."""
 
     def test_delete_habit_archives(
         self,
-        client,
+        auth_client,
         test_binary_habit: Habit,
-        auth_headers: dict,
         db_session: Session,
     ):
         """Test that deleting a habit archives it instead of deleting."""
-        response = client.delete(
-            f"/api/v1/habits/{test_binary_habit.id}",
-            headers=auth_headers,
+        habit_id = test_binary_habit.id
+        response = auth_client.delete(
+            f"/api/v1/habits/{habit_id}",
         )
 
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
         # Verify habit was archived, not deleted
-        db_session.refresh(test_binary_habit)
-        assert test_binary_habit.is_active is False
-
-    def test_delete_habit_not_found(self, client, auth_headers: dict):
-        """Test deleting non-existent habit."""
-        response = client.delete(
-            "/api/v1/habits/nonexistent-id",
-            headers=auth_headers,
-        )
-
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        is_active = db_session.query(Habit.is_active).filter(
+            Habit.id == habit_id
+        ).scalar()
+        assert is_active is False
 
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestBulkCreateHabits:
     """Tests for POST /api/v1/challenges/{challenge_id}/habits/bulk endpoint."""
 
-    def test_bulk_create_habits_success(
-        self, client, test_challenge: Challenge, auth_headers: dict
+    async def test_bulk_create_habits_success(
+        self, async_client, test_challenge: Challenge, auth_headers: dict
     ):
         """Test successfully creating multiple habits at once."""
         habits_data = {
             "habits": [
                 {
                     "name": "Meditate",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                     "preferred_time": "morning",
                     "order": 0,
                 },
                 {
                     "name": "Pushups",
-                    "type": HabitType.COUNTED.value,
+                    "type": _COUNTED,
                     "target_count": 20,
                     "preferred_time": "morning",
                     "order": 1,
                 },
                 {
                     "name": "Journal",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                     "preferred_time": "evening",
                     "order": 2,
                 },
             ]
         }
 
-        response = client.post(
+        response = await async_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits/bulk",
             headers=auth_headers,
             json=habits_data,
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = _json(response)
         assert len(data) == 3
         
         # Verify each habit was created correctly
-        assert data[0]["name"] == "Meditate"
-        assert data[0]["type"] == HabitType.BINARY.value
-        assert data[1]["name"] == "Pushups"
-        assert data[1]["targetCount"] == 20
-        assert data[2]["name"] == "Journal"
-
-    def test_bulk_create_with_template_ids(
-        self, client, test_challenge: Challenge, auth_headers: dict
+        expected = [
+            {"name": "Meditate", "type": _BINARY},
+            {"name": "Pushups", "targetCount": 20},
+            {"name": "Journal"},
+        ]
+        assert all(e.items() <= h.items() for e, h in zip(expected, data))
+
+    async def test_bulk_create_with_template_ids(
+        self, async_client, test_challenge: Challenge, auth_headers: dict
     ):
         """Test bulk creating habits with template IDs."""
         habits_data = {
             "habits": [
                 {
                     "name": "Vitamin D",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                     "preferred_time": "afternoon",
                     "template_id": "vitamin_d",
                 },
                 {
                     "name": "Meditate",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                     "preferred_time": "morning",
                     "template_id": "meditate",
                 },
             ]
         }
 
-        response = client.post(
+        response = await async_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits/bulk",
             headers=auth_headers,
             json=habits_data,
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = _json(response)
         assert len(data) == 2
         assert data[0]["templateId"] == "vitamin_d"
         assert data[1]["templateId"] == "meditate"
 
-    def test_bulk_create_auto_order(
-        self, client, test_challenge: Challenge, auth_headers: dict, db_session: Session
+    async def test_bulk_create_auto_order(
+        self, async_client, test_challenge: Challenge, auth_headers: dict, db_session: Session
     ):
         """Test that habits get assigned orders (either explicit or auto)."""
         # First check how many existing habits there are
-        existing_count = db_session.query(Habit).filter(
-            Habit.challenge_id == test_challenge.id,
-            Habit.is_active == True
-        ).count()
+        existing_count = db_session.execute(
+            select(func.count()).select_from(Habit).where(
+                Habit.challenge_id == test_challenge.id,
+                Habit.is_active.is_(True),
+            )
+        ).scalar()
         
         habits_data = {
             "habits": [
                 {
                     "name": "Habit 1",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                 },
                 {
                     "name": "Habit 2",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                 },
                 {
                     "name": "Habit 3",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                 },
             ]
         }
 
-        response = client.post(
+        response = await async_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits/bulk",
             headers=auth_headers,
             json=habits_data,
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = _json(response)
         
         # Verify all habits have an order field
         assert all("order" in h for h in data)
         # Verify we got 3 habits back
         assert len(data) == 3
 
-    def test_bulk_create_exceeds_limit(
-        self, client, test_challenge: Challenge, auth_headers: dict, db_session: Session
+    async def test_bulk_create_exceeds_limit(
+        self, async_client, test_challenge: Challenge, auth_headers: dict, db_session: Session
     ):
         """Test that bulk creation fails if total exceeds 10 habits."""
-        # Create 5 existing habits
-        for i in range(5):
-            habit = Habit(
-                id=str(uuid.uuid4()),
-                challenge_id=test_challenge.id,
-                name=f"Existing Habit {i}",
-                type=HabitType.BINARY,
-                order=i,
-                is_active=True,
-            )
-            db_session.add(habit)
+        # Create 5 existing habits in a single INSERT
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "challenge_id": test_challenge.id,
+                "name": f"Existing Habit {i}",
+                "type": HabitType.BINARY,
+                "order": i,
+                "is_active": True,
+            }
+            for i in range(5)
+        ]
+        db_session.bulk_insert_mappings(Habit, rows)
         db_session.commit()
 
         # Try to add 6 more (would total 11)
         habits_data = {
             "habits": [
-                {"name": f"New Habit {i}", "type": HabitType.BINARY.value}
+                {"name": f"New Habit {i}", "type": _BINARY}
                 for i in range(6)
             ]
         }
 
-        response = client.post(
+        response = await async_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits/bulk",
             headers=auth_headers,
             json=habits_data,
         )
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        assert "Maximum of 10 habits" in response.json()["detail"]
+        assert "Maximum of 10 habits" in _json(response)["detail"]
 
-    def test_bulk_create_exactly_10_habits(
-        self, client, test_challenge: Challenge, auth_headers: dict
+    async def test_bulk_create_exactly_10_habits(
+        self, async_client, test_challenge: Challenge, auth_headers: dict
     ):
         """Test creating exactly 10 habits at once."""
         habits_data = {
             "habits": [
-                {"name": f"Habit {i}", "type": HabitType.BINARY.value}
+                {"name": f"Habit {i}", "type": _BINARY}
                 for i in range(10)
             ]
         }
 
-        response = client.post(
+        response = await async_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits/bulk",
             headers=auth_headers,
             json=habits_data,
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = _json(response)
         assert len(data) == 10
 
-    def test_bulk_create_empty_list(
-        self, client, test_challenge: Challenge, auth_headers: dict
+    async def test_bulk_create_empty_list(
+        self, async_client, test_challenge: Challenge, auth_headers: dict
     ):
         """Test that empty habits list is rejected."""
         habits_data = {"habits": []}
 
-        response = client.post(
+        response = await async_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits/bulk",
             headers=auth_headers,
             json=habits_data,
@@ -560,18 +560,18 @@ class TestBulkCreateHabits:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-    def test_bulk_create_more_than_10_in_request(
-        self, client, test_challenge: Challenge, auth_headers: dict
+    async def test_bulk_create_more_than_10_in_request(
+        self, async_client, test_challenge: Challenge, auth_headers: dict
     ):
         """Test that more than 10 habits in single request is rejected."""
         habits_data = {
             "habits": [
-                {"name": f"Habit {i}", "type": HabitType.BINARY.value}
+                {"name": f"Habit {i}", "type": _BINARY}
                 for i in range(11)
             ]
         }
 
-        response = client.post(
+        response = await async_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits/bulk",
             headers=auth_headers,
             json=habits_data,
@@ -579,68 +579,73 @@ class TestBulkCreateHabits:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-    def test_bulk_create_challenge_not_found(self, client, auth_headers: dict):
-        """Test bulk creating habits for non-existent challenge."""
-        habits_data = {
-            "habits": [
-                {"name": "Test Habit", "type": HabitType.BINARY.value}
-            ]
-        }
-
-        response = client.post(
-            "/api/v1/challenges/nonexistent-id/habits/bulk",
-            headers=auth_headers,
-            json=habits_data,
-        )
-
-        assert response.status_code == status.HTTP_404_NOT_FOUND
-
-    def test_bulk_create_mixed_types(
-        self, client, test_challenge: Challenge, auth_headers: dict
+    async def test_bulk_create_mixed_types(
+        self, async_client, test_challenge: Challenge, auth_headers: dict
     ):
         """Test bulk creating mix of binary and counted habits."""
         habits_data = {
             "habits": [
                 {
                     "name": "Meditate",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                     "preferred_time": "morning",
                 },
                 {
                     "name": "Pushups",
-                    "type": HabitType.COUNTED.value,
+                    "type": _COUNTED,
                     "target_count": 50,
                     "preferred_time": "morning",
                 },
                 {
                     "name": "No Coffee",
-                    "type": HabitType.BINARY.value,
+                    "type": _BINARY,
                     "preferred_time": "all_day",
                 },
                 {
                     "name": "Drink Water",
-                    "type": HabitType.COUNTED.value,
+                    "type": _COUNTED,
                     "target_count": 8,
                     "preferred_time": "all_day",
                 },
             ]
         }
 
-        response = client.post(
+        response = await async_client.post(
             f"/api/v1/challenges/{test_challenge.id}/habits/bulk",
             headers=auth_headers,
             json=habits_data,
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        data = response.json()
+        data = _json(response)
         assert len(data) == 4
         
         # Verify binary habits
-        binary_habits = [h for h in data if h["type"] == HabitType.BINARY.value]
+        binary_habits = [h for h in data if h["type"] == _BINARY]
         assert len(binary_habits) == 2
         
         # Verify counted habits
-        counted_habits = [h for h in data if h["type"] == HabitType.COUNTED.value]
+        counted_habits = [h for h in data if h["type"] == _COUNTED]
         assert len(counted_habits) == 2
         assert all(h["targetCount"] is not None for h in counted_habits)
+
+
+class TestHabitNotFound:
+    """Tests that habit endpoints return 404 for nonexistent IDs."""
+
+    @pytest.mark.parametrize(
+        "method, url, body",
+        [
+            ("get", "/api/v1/challenges/nonexistent-id/habits", None),
+            ("get", "/api/v1/habits/nonexistent-id", None),
+            ("put", "/api/v1/habits/nonexistent-id", _UPDATE_NOT_FOUND_PAYLOAD),
+            ("delete", "/api/v1/habits/nonexistent-id", None),
+            ("post", "/api/v1/challenges/nonexistent-id/habits/bulk", _BULK_NOT_FOUND_PAYLOAD),
+        ],
+        ids=["list", "get", "update", "delete", "bulk_create"],
+    )
+    def test_not_found(self, auth_client, method: str, url: str, body):
+        """Test that a nonexistent habit or challenge returns 404."""
+        response = auth_client.request(method, url, json=body)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
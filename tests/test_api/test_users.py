@@ -10,10 +10,10 @@ class TestGetUserProfile:
     """Tests for GET /api/v1/users/profile endpoint."""
 
     def test_get_user_profile_success(
-        self, client: TestClient, test_user: User, auth_headers: dict
+        self, auth_client: TestClient, test_user: User
     ):
         """Test successful retrieval of user profile."""
-        response = client.get("/api/v1/users/profile", headers=auth_headers)
+        response = auth_client.get("/api/v1/users/profile")
         assert response.status_code == 200
         data = response.json()
         assert data["id"] == test_user.id
@@ -31,13 +31,13 @@ class TestUpdateUserProfile:
     """Tests for PUT /api/v1/users/profile endpoint."""
 
     def test_update_user_profile_success(
-        self, client: TestClient, test_user: User, auth_headers: dict, db_session: Session
+        self, auth_client: TestClient, test_user: User, db_session: Session
     ):
         """Test successful update of user profile."""
         new_name = "Updated Name"
-        response = client.put(
-            f"/api/v1/users/profile?name={new_name}",
-            headers=auth_headers
+        response = auth_client.put(
+            "/api/v1/users/profile",
+            params={"name": new_name},
         )
         assert response.status_code == 200
         data = response.json()
@@ -50,5 +50,5 @@ class TestUpdateUserProfile:
 
     def test_update_user_profile_unauthorized(self, client: TestClient):
         """Test updating profile without authentication."""
-        response = client.put("/api/v1/users/profile?name=New Name")
+        response = client.put("/api/v1/users/profile", params={"name": "New Name"})
         assert response.status_code == 403
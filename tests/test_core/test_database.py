@@ -1,64 +1,67 @@
 """Tests for database connection and session management."""
 
 import pytest
-from unittest.mock import patch, MagicMock
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from unittest.mock import MagicMock
+from app.core import database
 from app.core.database import get_db, init_db
 
+_SENTINEL = object()
 
-class TestGetDB:
-    """Tests for get_db() dependency function."""
 
-    def test_get_db_yields_session(self):
-        """Test that get_db() yields a database session and closes it."""
-        session_created = False
-        session_closed = False
+class _StubSession:
+    """Minimal stand-in for a Session that records whether it was closed."""
 
-        # Mock SessionLocal to track session lifecycle
-        mock_session = MagicMock(spec=Session)
+    def __init__(self):
+        self.closed = False
 
-        def track_close():
-            nonlocal session_closed
-            session_closed = True
+    def close(self):
+        self.closed = True
 
-        mock_session.close = track_close
 
-        with patch('app.core.database.SessionLocal') as mock_session_local:
-            mock_session_local.return_value = mock_session
-            session_created = True
+@pytest.fixture(autouse=True)
+def stub_session(monkeypatch) -> _StubSession:
+    """Make get_db() hand out a stub session instead of a real one."""
+    stub = _StubSession()
+    monkeypatch.setattr(database, "get_session_local", lambda: lambda: stub)
+    return stub
 
-            # Use the generator
-            gen = get_db()
-            session = next(gen)
 
-            assert session_created
-            assert session == mock_session
-            assert not session_closed
+@pytest.fixture(autouse=True)
+def mock_metadata(monkeypatch) -> MagicMock:
+    """Replace Base so init_db() does not touch the real schema."""
+    mock_base = MagicMock()
+    monkeypatch.setattr(database, "Base", mock_base)
+    return mock_base.metadata
 
-            # Complete the generator (simulating end of request)
-            try:
-                next(gen)
-            except StopIteration:
-                pass
 
-            # Session should be closed after generator completes
-            assert session_closed
+class TestGetDB:
+    """Tests for get_db() dependency function."""
+
+    def test_get_db_yields_session(self, stub_session: _StubSession):
+        """Test that get_db() yields a database session and closes it."""
+        # Use the generator
+        gen = get_db()
+        session = next(gen)
+
+        assert session is stub_session
+        assert not stub_session.closed
+
+        # Complete the generator (simulating end of request)
+        assert next(gen, _SENTINEL) is _SENTINEL
+
+        # Session should be closed after generator completes
+        assert stub_session.closed is True
 
 
 class TestInitDB:
     """Tests for init_db() function."""
 
-    def test_init_db_creates_all_tables(self):
+    def test_init_db_creates_all_tables(self, mock_metadata: MagicMock):
         """Test that init_db() creates all database tables."""
-        with patch('app.core.database.Base') as mock_base:
-            mock_metadata = MagicMock()
-            mock_base.metadata = mock_metadata
-
-            init_db()
+        init_db()
 
-            # Verify create_all was called
-            mock_metadata.create_all.assert_called_once()
+        # Verify create_all was called
+        mock_metadata.create_all.assert_called_once()
 
 
 class TestDatabaseEngineConfiguration:
@@ -1,56 +1,51 @@
 """Tests for Google OAuth utilities."""
 
-from unittest.mock import AsyncMock, patch, Mock
-
 import pytest
 from fastapi import HTTPException, status
 import httpx
 
+from app.core.oauth import GOOGLE_TOKEN_URL, GOOGLE_USERINFO_URL
+
+# Run every test on the session event loop instead of creating one per test
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+# Canned Google responses, built once and served by the mock_httpx fixture
+_TOKEN_OK = httpx.Response(200, json={
+    "access_token": "ya29.test_access_token",
+    "token_type": "Bearer",
+    "expires_in": 3599,
+})
+_USERINFO_OK = httpx.Response(200, json={
+    "id": "123456789",
+    "email": "user@example.com",
+    "name": "Test User",
+    "picture": "https://example.com/pic.jpg",
+})
+_ERR_400 = httpx.Response(400, text='{"error": "invalid_grant", "error_description": "Bad Request"}')
+_ERR_401 = httpx.Response(401, text='{"error": "unauthorized_client"}')
+_ERR_INVALID_TOKEN = httpx.Response(401, text='{"error": "invalid_token"}')
+_ERR_403 = httpx.Response(403, text='{"error": "access_denied"}')
+
 
 class TestExchangeCodeForToken:
     """Tests for exchange_code_for_token function."""
 
-    @pytest.mark.asyncio
-    async def test_exchange_code_success(self):
+    async def test_exchange_code_success(self, mock_httpx):
         """Test successful authorization code exchange."""
         from app.core.oauth import exchange_code_for_token
 
-        # Mock the httpx client and response
-        with patch("app.core.oauth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json = Mock(return_value={
-                "access_token": "ya29.test_access_token",
-                "token_type": "Bearer",
-                "expires_in": 3599,
-            })
-
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.post = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value = mock_client
-
-            result = await exchange_code_for_token("test_code", "http://localhost:5173/callback")
-
-            assert result["access_token"] == "ya29.test_access_token"
-            assert result["token_type"] == "Bearer"
-
-    @pytest.mark.asyncio
-    @patch("app.core.oauth.httpx.AsyncClient")
-    async def test_exchange_code_failure(self, mock_client_class):
+        mock_httpx[GOOGLE_TOKEN_URL] = _TOKEN_OK
+
+        result = await exchange_code_for_token("test_code", "http://localhost:5173/callback")
+
+        assert result["access_token"] == "ya29.test_access_token"
+        assert result["token_type"] == "Bearer"
+
+    async def test_exchange_code_failure(self, mock_httpx):
         """Test failed authorization code exchange."""
         from app.core.oauth import exchange_code_for_token
 
-        # Mock failed response
-        mock_response = AsyncMock()
-        mock_response.status_code = 400
-        mock_response.text = '{"error": "invalid_grant", "error_description": "Bad Request"}'
-
-        mock_client = AsyncMock()
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_client.post.return_value = mock_response
-        mock_client_class.return_value = mock_client
+        mock_httpx[GOOGLE_TOKEN_URL] = _ERR_400
 
         with pytest.raises(HTTPException) as exc_info:
             await exchange_code_for_token("invalid_code", "http://localhost:5173/callback")
@@ -58,22 +53,11 @@ class TestExchangeCodeForToken:
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
         assert "Failed to exchange authorization code for token" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    @patch("app.core.oauth.httpx.AsyncClient")
-    async def test_exchange_code_failure_401(self, mock_client_class):
+    async def test_exchange_code_failure_401(self, mock_httpx):
         """Test authorization code exchange with 401 response."""
         from app.core.oauth import exchange_code_for_token
 
-        # Mock unauthorized response
-        mock_response = AsyncMock()
-        mock_response.status_code = 401
-        mock_response.text = '{"error": "unauthorized_client"}'
-
-        mock_client = AsyncMock()
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_client.post.return_value = mock_response
-        mock_client_class.return_value = mock_client
+        mock_httpx[GOOGLE_TOKEN_URL] = _ERR_401
 
         with pytest.raises(HTTPException) as exc_info:
             await exchange_code_for_token("invalid_code", "http://localhost:5173/callback")
@@ -84,49 +68,23 @@ class TestExchangeCodeForToken:
 class TestGetGoogleUserInfo:
     """Tests for get_google_user_info function."""
 
-    @pytest.mark.asyncio
-    async def test_get_user_info_success(self):
+    async def test_get_user_info_success(self, mock_httpx):
         """Test successful user info retrieval."""
         from app.core.oauth import get_google_user_info
 
-        # Mock the httpx client and response
-        with patch("app.core.oauth.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json = Mock(return_value={
-                "id": "123456789",
-                "email": "user@example.com",
-                "name": "Test User",
-                "picture": "https://example.com/pic.jpg",
-            })
-
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value = mock_client
-
-            result = await get_google_user_info("test_access_token")
-
-            assert result["id"] == "123456789"
-            assert result["email"] == "user@example.com"
-            assert result["name"] == "Test User"
-
-    @pytest.mark.asyncio
-    @patch("app.core.oauth.httpx.AsyncClient")
-    async def test_get_user_info_failure(self, mock_client_class):
+        mock_httpx[GOOGLE_USERINFO_URL] = _USERINFO_OK
+
+        result = await get_google_user_info("test_access_token")
+
+        assert result["id"] == "123456789"
+        assert result["email"] == "user@example.com"
+        assert result["name"] == "Test User"
+
+    async def test_get_user_info_failure(self, mock_httpx):
         """Test failed user info retrieval."""
         from app.core.oauth import get_google_user_info
 
-        # Mock failed response
-        mock_response = AsyncMock()
-        mock_response.status_code = 401
-        mock_response.text = '{"error": "invalid_token"}'
-
-        mock_client = AsyncMock()
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_client.get.return_value = mock_response
-        mock_client_class.return_value = mock_client
+        mock_httpx[GOOGLE_USERINFO_URL] = _ERR_INVALID_TOKEN
 
         with pytest.raises(HTTPException) as exc_info:
             await get_google_user_info("invalid_token")
@@ -134,22 +92,11 @@ class TestGetGoogleUserInfo:
         assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
         assert "Failed to get user info from Google" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    @patch("app.core.oauth.httpx.AsyncClient")
-    async def test_get_user_info_failure_403(self, mock_client_class):
+    async def test_get_user_info_failure_403(self, mock_httpx):
         """Test user info retrieval with 403 response."""
         from app.core.oauth import get_google_user_info
 
-        # Mock forbidden response
-        mock_response = AsyncMock()
-        mock_response.status_code = 403
-        mock_response.text = '{"error": "access_denied"}'
-
-        mock_client = AsyncMock()
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_client.get.return_value = mock_response
-        mock_client_class.return_value = mock_client
+        mock_httpx[GOOGLE_USERINFO_URL] = _ERR_403
 
         with pytest.raises(HTTPException) as exc_info:
             await get_google_user_info("restricted_token")
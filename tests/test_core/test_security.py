@@ -1,72 +1,89 @@
 """Security and JWT token tests."""
 
+import base64
+import hashlib
+import hmac
+import json
+from dataclasses import dataclass
 from datetime import timedelta
-from unittest.mock import MagicMock
+from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
-from jose import jwt
+import jwt
 
 from app.config import settings
-from app.core.security import create_access_token, decode_access_token, get_current_user
+from app.core.security import (
+    _DECODE_KWARGS,
+    _invalid_token_cache,
+    _token_cache,
+    create_access_token,
+    decode_access_token,
+    decode_access_tokens_batch,
+    get_current_user,
+    invalidate_user,
+)
 from app.models.user import User
 
+# Keep the auth tests on one xdist worker (with --dist loadgroup) so the
+# session-scoped token fixture is signed once rather than once per worker
+pytestmark = pytest.mark.xdist_group("auth")
+
+
+@dataclass(frozen=True, slots=True)
+class FakeCreds:
+    """Stand-in for HTTPAuthorizationCredentials; get_current_user only reads .credentials."""
+
+    credentials: str
+
+
+VALID_TOKEN_SUB = "test-user-123"
+
+
+@pytest.fixture(scope="session")
+def valid_token() -> str:
+    """Sign one token for the canonical test subject, shared by the whole session."""
+    return create_access_token(data={"sub": VALID_TOKEN_SUB})
+
 
 class TestCreateAccessToken:
     """Tests for JWT token creation."""
 
-    def test_create_token_success(self):
-        """Test successfully creating a JWT token."""
-        user_id = "test-user-123"
-        token = create_access_token(data={"sub": user_id})
+    @pytest.mark.parametrize(
+        "data, expires_delta, expected",
+        [
+            ({"sub": "test-user-123"}, None, {"sub": "test-user-123"}),
+            ({"sub": "test-user-123"}, timedelta(minutes=30), {"sub": "test-user-123"}),
+            (
+                {"sub": "test-user-123", "email": "test@example.com", "role": "user"},
+                None,
+                {"sub": "test-user-123", "email": "test@example.com", "role": "user"},
+            ),
+        ],
+        ids=["default_expiration", "custom_expiration", "additional_claims"],
+    )
+    def test_create_token(self, data: dict, expires_delta, expected: dict):
+        """Test creating a JWT token and decoding its claims."""
+        token = create_access_token(data=data, expires_delta=expires_delta)
 
         assert isinstance(token, str)
         assert len(token) > 0
 
         # Decode and verify
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        assert payload["sub"] == user_id
+        payload = jwt.decode(token, **_DECODE_KWARGS)
+        assert {key: payload[key] for key in expected} == expected
         assert "exp" in payload
 
-    def test_create_token_with_custom_expiration(self):
-        """Test creating token with custom expiration time."""
-        user_id = "test-user-123"
-        expires_delta = timedelta(minutes=30)
-        token = create_access_token(data={"sub": user_id}, expires_delta=expires_delta)
-
-        assert isinstance(token, str)
-
-        # Decode and verify expiration
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        assert payload["sub"] == user_id
-
-    def test_create_token_with_additional_claims(self):
-        """Test creating token with additional claims."""
-        data = {
-            "sub": "test-user-123",
-            "email": "test@example.com",
-            "role": "user",
-        }
-        token = create_access_token(data=data)
-
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        assert payload["sub"] == "test-user-123"
-        assert payload["email"] == "test@example.com"
-        assert payload["role"] == "user"
-
 
 class TestDecodeAccessToken:
     """Tests for JWT token decoding and validation."""
 
-    def test_decode_valid_token(self):
+    def test_decode_valid_token(self, valid_token: str):
         """Test decoding a valid JWT token."""
-        user_id = "test-user-123"
-        token = create_access_token(data={"sub": user_id})
-
-        payload = decode_access_token(token)
+        payload = decode_access_token(valid_token)
 
         assert payload is not None
-        assert payload["sub"] == user_id
+        assert payload["sub"] == VALID_TOKEN_SUB
 
     def test_decode_invalid_token(self):
         """Test decoding an invalid token."""
@@ -76,6 +93,17 @@ class TestDecodeAccessToken:
 
         assert payload is None
 
+    @pytest.mark.parametrize(
+        "token",
+        ["", "not-a-jwt", "only.two", "a.b.c.d", "has space.b.c", "a..c", "a.b.c="],
+    )
+    def test_decode_malformed_fast_path(self, token: str):
+        """Test that strings that are not shaped like a JWT skip verification."""
+        with patch("app.core.security.jwt.decode") as mock_decode:
+            assert decode_access_token(token) is None
+
+        mock_decode.assert_not_called()
+
     def test_decode_expired_token(self):
         """Test decoding an expired token."""
         user_id = "test-user-123"
@@ -88,12 +116,10 @@ class TestDecodeAccessToken:
 
         assert payload is None
 
-    def test_decode_tampered_token(self):
+    def test_decode_tampered_token(self, valid_token: str):
         """Test decoding a token that has been tampered with."""
-        token = create_access_token(data={"sub": "test-user-123"})
-
         # Tamper with token
-        parts = token.split(".")
+        parts = valid_token.split(".")
         tampered_token = parts[0] + ".tampered." + parts[2]
 
         payload = decode_access_token(tampered_token)
@@ -113,6 +139,70 @@ class TestDecodeAccessToken:
 
         assert payload is None
 
+    def test_decode_reuses_cached_payload(self, valid_token: str):
+        """Test that decoding the same token twice verifies it only once."""
+        with patch("app.core.security.jwt.decode", wraps=jwt.decode) as mock_decode:
+            first = decode_access_token(valid_token)
+            second = decode_access_token(valid_token)
+
+        assert first == second
+        assert mock_decode.call_count == 1
+
+    def test_decode_remembers_failures(self):
+        """Test that a token that failed to decode is not verified again."""
+        with patch("app.core.security.jwt.decode", wraps=jwt.decode) as mock_decode:
+            assert decode_access_token("invalid.token.here") is None
+            assert decode_access_token("invalid.token.here") is None
+
+        assert mock_decode.call_count == 1
+
+
+def _resign_with_header(token: str, header: dict) -> str:
+    """Swap a token's header and sign it with the configured HMAC algorithm."""
+    encoded_header = base64.urlsafe_b64encode(json.dumps(header).encode()).rstrip(b"=").decode()
+    signing_input = encoded_header + "." + token.split(".")[1]
+    signature = hmac.new(settings.SECRET_KEY.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return signing_input + "." + base64.urlsafe_b64encode(signature).rstrip(b"=").decode()
+
+
+class TestBatchDecode:
+    """Tests for decoding several JWT tokens at once."""
+
+    def test_batch_matches_single_decode(self, valid_token: str):
+        """Test that batch decoding gives the same results as decoding one by one."""
+        parts = valid_token.split(".")
+        tokens = [
+            valid_token,
+            create_access_token(data={"sub": "test-user-123"}, expires_delta=timedelta(minutes=-30)),
+            parts[0] + ".tampered." + parts[2],
+            jwt.encode({"sub": "test-user-123"}, "wrong-secret-key", algorithm=settings.ALGORITHM),
+            "invalid.token.here",
+            "not-a-jwt",
+            _resign_with_header(valid_token, {"alg": "HS512", "typ": "JWT"}),
+            _resign_with_header(valid_token, {"alg": "none", "typ": "JWT"}),
+        ]
+
+        batch = decode_access_tokens_batch(tokens)
+        _token_cache.clear()
+        _invalid_token_cache.clear()
+
+        assert batch == [decode_access_token(token) for token in tokens]
+        assert batch[0]["sub"] == VALID_TOKEN_SUB
+        assert batch[1:] == [None] * 7
+
+    def test_batch_empty(self):
+        """Test batch decoding an empty list."""
+        assert decode_access_tokens_batch([]) == []
+
+    def test_batch_non_hmac_algorithm_falls_back(self, monkeypatch, valid_token: str):
+        """Test that non-HMAC algorithms are decoded one token at a time."""
+        monkeypatch.setattr("app.core.security._ALGORITHM", "RS256")
+
+        with patch("app.core.security.decode_access_token", return_value=None) as mock_decode:
+            assert decode_access_tokens_batch([valid_token]) == [None]
+
+        mock_decode.assert_called_once_with(valid_token)
+
 
 class TestGetCurrentUser:
     """Tests for get_current_user dependency function."""
@@ -122,9 +212,7 @@ class TestGetCurrentUser:
         """Test successfully getting current user from valid token."""
         token = create_access_token(data={"sub": test_user.id})
 
-        # Mock credentials
-        credentials = MagicMock()
-        credentials.credentials = token
+        credentials = FakeCreds(token)
 
         user = await get_current_user(credentials=credentials, db=db_session)
 
@@ -134,8 +222,7 @@ class TestGetCurrentUser:
     @pytest.mark.asyncio
     async def test_get_current_user_invalid_token(self, db_session):
         """Test get_current_user with invalid token."""
-        credentials = MagicMock()
-        credentials.credentials = "invalid.token.here"
+        credentials = FakeCreds("invalid.token.here")
 
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(credentials=credentials, db=db_session)
@@ -149,8 +236,7 @@ class TestGetCurrentUser:
         # Create token without 'sub' claim
         token = create_access_token(data={"email": "test@example.com"})
 
-        credentials = MagicMock()
-        credentials.credentials = token
+        credentials = FakeCreds(token)
 
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(credentials=credentials, db=db_session)
@@ -163,8 +249,7 @@ class TestGetCurrentUser:
         # Create token for non-existent user
         token = create_access_token(data={"sub": "nonexistent-user-id"})
 
-        credentials = MagicMock()
-        credentials.credentials = token
+        credentials = FakeCreds(token)
 
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(credentials=credentials, db=db_session)
@@ -172,6 +257,53 @@ class TestGetCurrentUser:
         assert exc_info.value.status_code == 401
         assert "Could not validate credentials" in str(exc_info.value.detail)
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_uses_cached_user(self, test_user: User, db_session, count_queries):
+        """Test that repeated lookups for the same user skip the database."""
+        token = create_access_token(data={"sub": test_user.id})
+        credentials = FakeCreds(token)
+        await get_current_user(credentials=credentials, db=db_session)
+
+        with count_queries() as queries:
+            for _ in range(100):
+                user = await get_current_user(credentials=credentials, db=db_session)
+
+        assert queries == []
+        assert user.id == test_user.id
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_missing_user_not_cached(self, db_session):
+        """Test that a missing user is found once the account exists."""
+        token = create_access_token(data={"sub": "late-user-id"})
+        credentials = FakeCreds(token)
+
+        with pytest.raises(HTTPException):
+            await get_current_user(credentials=credentials, db=db_session)
+
+        db_session.add(User(
+            id="late-user-id",
+            email="late@example.com",
+            name="Late User",
+            google_id="google_late_789",
+        ))
+        db_session.commit()
+
+        user = await get_current_user(credentials=credentials, db=db_session)
+        assert user.id == "late-user-id"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user_reloads_from_database(self, test_user: User, db_session, count_queries):
+        """Test that invalidate_user forces the next lookup to query the database."""
+        token = create_access_token(data={"sub": test_user.id})
+        credentials = FakeCreds(token)
+        await get_current_user(credentials=credentials, db=db_session)
+
+        invalidate_user(test_user.id)
+        with count_queries() as queries:
+            await get_current_user(credentials=credentials, db=db_session)
+
+        assert len(queries) == 1
+
     @pytest.mark.asyncio
     async def test_get_current_user_expired_token(self, test_user: User, db_session):
         """Test get_current_user with expired token."""
@@ -181,8 +313,7 @@ class TestGetCurrentUser:
             expires_delta=timedelta(minutes=-30)
         )
 
-        credentials = MagicMock()
-        credentials.credentials = token
+        credentials = FakeCreds(token)
 
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(credentials=credentials, db=db_session)
@@ -195,25 +326,27 @@ class TestTokenSecurity:
 
     def test_tokens_are_unique(self):
         """Test that each token generation creates unique tokens."""
-        import time
         user_id = "test-user-123"
         token1 = create_access_token(data={"sub": user_id})
-        time.sleep(1.1)  # Sleep to ensure different exp times (JWT rounds to seconds)
         token2 = create_access_token(data={"sub": user_id})
 
-        # Tokens should be different due to different exp times
+        # Tokens differ by their jti even when issued in the same second
         assert token1 != token2
 
-    def test_token_cannot_be_modified(self):
-        """Test that modifying token payload invalidates it."""
-        token = create_access_token(data={"sub": "user-123"})
+    def test_jti_present_and_unique(self):
+        """Test that tokens carry distinct jti claims."""
+        token1 = create_access_token(data={"sub": "test-user-123"})
+        token2 = create_access_token(data={"sub": "test-user-123"})
 
+        jti1 = jwt.decode(token1, **_DECODE_KWARGS)["jti"]
+        jti2 = jwt.decode(token2, **_DECODE_KWARGS)["jti"]
+        assert jti1 and jti2
+        assert jti1 != jti2
+
+    def test_token_cannot_be_modified(self, valid_token: str):
+        """Test that modifying token payload invalidates it."""
         # Decode, modify, and re-encode with different secret
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = jwt.decode(valid_token, **_DECODE_KWARGS)
         payload["sub"] = "hacker-456"
 
         # Re-encode with same secret